@@ -9,12 +9,67 @@ These utilities assist with:
 - Workspace management
 """
 
+import dataclasses
+import hashlib
 import json
+import math
+import os
 import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Iterable, Tuple
 from datetime import datetime
 
+# Optional accelerators: fall back to the stdlib when unavailable
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+except ImportError:
+    rf_fuzz = rf_process = None
+
+
+_DISTILLED_SCHEMA = {
+    'type': 'object',
+    'required': ['paper_id', 'distilled_items'],
+    'properties': {
+        'distilled_items': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['type', 'name', 'explanation', 'relevance_to_problem'],
+            },
+        },
+    },
+}
+
+_schema_validator = fastjsonschema.compile(_DISTILLED_SCHEMA) if fastjsonschema else None
+
+# Candidate pairs below which process pool startup outweighs the speedup
+_PARALLEL_MIN_PAIRS = 50000
+
+# validate_distilled_json results keyed by BLAKE2b digest of the file contents
+_VALIDATION_CACHE_SIZE = 512
+_validation_cache: Dict[bytes, Tuple[bool, str]] = {}
+
+# Below this many edges the Counter path beats converting to arrays
+_VECTORIZE_MIN_EDGES = 10000
+
 
 def validate_distilled_json(file_path: str) -> Tuple[bool, str]:
     """
@@ -24,26 +79,43 @@ def validate_distilled_json(file_path: str) -> Tuple[bool, str]:
         (is_valid, error_message)
     """
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except Exception as e:
+        return False, f"Error: {e}"
+
+    # Results depend only on file contents, so memoize by content hash
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    result = _validation_cache.get(digest)
+    if result is None:
+        result = _validate_content(content)
+        if len(_validation_cache) >= _VALIDATION_CACHE_SIZE:
+            del _validation_cache[next(iter(_validation_cache))]  # Evict oldest
+        _validation_cache[digest] = result
+
+    return result
 
-        # Check required top-level fields
-        required_fields = ['paper_id', 'distilled_items']
-        for field in required_fields:
-            if field not in data:
-                return False, f"Missing required field: {field}"
 
-        # Check distilled_items structure
-        if not isinstance(data['distilled_items'], list):
-            return False, "distilled_items must be an array"
+def _validate_content(content: bytes) -> Tuple[bool, str]:
+    """
+    Validate raw distilled JSON bytes.
 
-        for i, item in enumerate(data['distilled_items']):
-            required_item_fields = ['type', 'name', 'explanation', 'relevance_to_problem']
-            for field in required_item_fields:
-                if field not in item:
-                    return False, f"Item {i} missing field: {field}"
+    Returns:
+        (is_valid, error_message)
+    """
+    try:
+        data = _json.loads(content)
+
+        if _schema_validator is not None:
+            try:
+                _schema_validator(data)
+                return True, "Valid"
+            except fastjsonschema.JsonSchemaException as e:
+                # Rare path: re-walk the data for the usual, more specific message
+                is_valid, message = _check_distilled_structure(data)
+                return False, message if not is_valid else e.message
 
-        return True, "Valid"
+        return _check_distilled_structure(data)
 
     except json.JSONDecodeError as e:
         return False, f"Invalid JSON: {e}"
@@ -51,6 +123,32 @@ def validate_distilled_json(file_path: str) -> Tuple[bool, str]:
         return False, f"Error: {e}"
 
 
+def _check_distilled_structure(data: Any) -> Tuple[bool, str]:
+    """
+    Check distilled JSON structure field by field.
+
+    Returns:
+        (is_valid, error_message)
+    """
+    # Check required top-level fields
+    required_fields = ['paper_id', 'distilled_items']
+    for field in required_fields:
+        if field not in data:
+            return False, f"Missing required field: {field}"
+
+    # Check distilled_items structure
+    if not isinstance(data['distilled_items'], list):
+        return False, "distilled_items must be an array"
+
+    for i, item in enumerate(data['distilled_items']):
+        required_item_fields = ['type', 'name', 'explanation', 'relevance_to_problem']
+        for field in required_item_fields:
+            if field not in item:
+                return False, f"Item {i} missing field: {field}"
+
+    return True, "Valid"
+
+
 def calculate_centrality(graph: Dict[str, Any]) -> Dict[str, float]:
     """
     Calculate simple in-degree centrality for all nodes.
@@ -64,26 +162,87 @@ def calculate_centrality(graph: Dict[str, Any]) -> Dict[str, float]:
     if not nodes:
         return {}
 
-    # Count in-degree for each node
-    in_degree = {node['id']: 0 for node in nodes}
+    # Count in-degree for each node (dict keeps node order, gives O(1) lookups)
+    node_ids = dict.fromkeys(node['id'] for node in nodes)
 
-    for edge in edges:
-        to_node = edge.get('to')
-        if to_node in in_degree:
-            in_degree[to_node] += 1
+    if np is not None and len(edges) >= _VECTORIZE_MIN_EDGES:
+        return _centrality_numpy(node_ids, edges)
 
-    # Normalize by max possible edges
-    max_degree = max(in_degree.values()) if in_degree.values() else 1
+    in_degree = Counter(edge.get('to') for edge in edges if edge.get('to') in node_ids)
 
-    if max_degree == 0:
-        return {node_id: 0.0 for node_id in in_degree}
+    # Normalize by max possible edges; all scores are 0.0 when there are no edges
+    max_degree = max(in_degree.values(), default=0) or 1
 
-    centrality = {
-        node_id: degree / max_degree
-        for node_id, degree in in_degree.items()
-    }
+    return {node_id: in_degree[node_id] / max_degree for node_id in node_ids}
+
+
+def _centrality_numpy(node_ids: Dict[str, None], edges: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    In-degree centrality as a column sum over edge targets, for large graphs.
+    """
+    id_to_idx = {node_id: idx for idx, node_id in enumerate(node_ids)}
+    targets = np.fromiter(
+        (id_to_idx[edge.get('to')] for edge in edges if edge.get('to') in id_to_idx),
+        dtype=np.intp,
+    )
 
-    return centrality
+    in_degree = np.bincount(targets, minlength=len(id_to_idx))
+    max_degree = int(in_degree.max()) or 1
+
+    return dict(zip(id_to_idx, (in_degree / max_degree).tolist()))
+
+
+@dataclasses.dataclass
+class CentralityCache:
+    """
+    In-degree centrality maintained incrementally from edge deltas.
+
+    Build once with from_graph(), then call update() as edges change and
+    scores() for the normalized values, instead of re-running
+    calculate_centrality() over the whole edge list.
+    """
+    node_ids: Dict[str, None]
+    in_degree: Counter = dataclasses.field(default_factory=Counter)
+    max_degree: int = 0
+
+    @classmethod
+    def from_graph(cls, graph: Dict[str, Any]) -> 'CentralityCache':
+        node_ids = dict.fromkeys(node['id'] for node in graph.get('nodes', []))
+        in_degree = Counter(
+            edge.get('to') for edge in graph.get('edges', []) if edge.get('to') in node_ids
+        )
+        return cls(node_ids, in_degree, max(in_degree.values(), default=0))
+
+    def update(self, added: Iterable[Dict[str, Any]] = (),
+               removed: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Apply added and removed edges to the cached in-degrees.
+        """
+        max_stale = False
+
+        for edge in added:
+            to_node = edge.get('to')
+            if to_node in self.node_ids:
+                self.in_degree[to_node] += 1
+                self.max_degree = max(self.max_degree, self.in_degree[to_node])
+
+        for edge in removed:
+            to_node = edge.get('to')
+            if to_node in self.node_ids and self.in_degree[to_node] > 0:
+                # Only a node at the maximum can lower it
+                if self.in_degree[to_node] == self.max_degree:
+                    max_stale = True
+                self.in_degree[to_node] -= 1
+
+        if max_stale:
+            self.max_degree = max(self.in_degree.values(), default=0)
+
+    def scores(self) -> Dict[str, float]:
+        """
+        Return node_id -> centrality_score (0.0 to 1.0), as calculate_centrality.
+        """
+        max_degree = self.max_degree or 1
+        return {node_id: self.in_degree[node_id] / max_degree for node_id in self.node_ids}
 
 
 def find_similar_concepts(items: List[Dict[str, Any]], threshold: float = 0.8) -> List[Tuple[int, int]]:
@@ -93,33 +252,192 @@ def find_similar_concepts(items: List[Dict[str, Any]], threshold: float = 0.8) -
     Uses simple string similarity on names and explanations.
     Returns list of (index1, index2) pairs that might be duplicates.
     """
+    # Normalize strings once rather than for every pair
+    names = [item.get('name', '').lower() for item in items]
+    exps = [item.get('explanation', '')[:200].lower() for item in items]
+
+    # Only items of the same type can be duplicates, so compare within type buckets
+    buckets: Dict[Any, List[int]] = defaultdict(list)
+    for idx, item in enumerate(items):
+        buckets[item.get('type')].append(idx)
+
+    tasks = [
+        (indices, [names[k] for k in indices], [exps[k] for k in indices], threshold)
+        for indices in buckets.values()
+        if len(indices) > 1
+    ]
+
+    # cdist is already multithreaded; fan the difflib fallback out over
+    # processes when there is enough work to pay for pool startup
+    use_pool = (
+        (rf_process is None or np is None)
+        and len(tasks) > 1
+        and _available_cpus() > 1
+        and sum(len(t[0]) ** 2 for t in tasks) // 2 >= _PARALLEL_MIN_PAIRS
+    )
+
+    if use_pool:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_bucket_pairs, tasks))
+    else:
+        results = [_bucket_pairs(task) for task in tasks]
+
+    duplicates = [pair for pairs in results for pair in pairs]
+    duplicates.sort()
+    return duplicates
+
+
+def _available_cpus() -> int:
+    """
+    CPUs this process may run on (respects affinity/container limits where known).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _bucket_pairs(task: Tuple[List[int], List[str], List[str], float]) -> List[Tuple[int, int]]:
+    """
+    Find similar pairs within one type bucket.
+
+    Takes (indices, names, exps, threshold) with names/exps sliced to the
+    bucket and returns pairs of global item indices. Kept at module level
+    so it can be sent to worker processes.
+    """
+    indices, names, exps, threshold = task
+
+    # A pair is flagged if either its names or its explanations are similar
+    if rf_process is not None and np is not None:
+        pairs = set(_similar_pairs_cdist(names, threshold))
+        pairs.update(_similar_pairs_cdist(exps, threshold))
+    else:
+        pairs = set(_similar_name_pairs(names, threshold))
+        pairs.update(_similar_pairs_difflib(exps, threshold))
+
+    return [(indices[i], indices[j]) for i, j in pairs]
+
+
+def _char_tokens(text: str) -> frozenset:
+    """
+    Characters of text numbered by occurrence, e.g. "aab" -> a#0, a#1, b#0.
+
+    Set operations on these tokens are multiset operations on the characters.
+    """
+    seen: Counter = Counter()
+    tokens = []
+    for char in text:
+        tokens.append((char, seen[char]))
+        seen[char] += 1
+    return frozenset(tokens)
+
+
+def _name_candidates(names: List[str], threshold: float) -> List[Tuple[int, int]]:
+    """
+    Candidate name pairs that may have a difflib ratio above threshold.
+
+    The ratio is at most 2 * |common characters| / (len(a) + len(b))
+    (difflib's quick_ratio), so a pair can only pass if the Jaccard
+    similarity of its character tokens exceeds threshold / (2 - threshold).
+    Candidates are found by prefix filtering: with tokens ordered rarest
+    first, two sets with Jaccard >= j must share a token within the first
+    |s| - ceil(j * |s|) + 1 of each. Empty names have no tokens but a ratio
+    of 1.0 with each other, so they are paired up directly. No pair the
+    ratio would accept is dropped.
+
+    Returns (i, j) pairs with i < j, grouped by j.
+    """
+    jaccard_threshold = threshold / (2 - threshold)
+
+    token_sets = [_char_tokens(name) for name in names]
+    frequency = Counter(token for tokens in token_sets for token in tokens)
+
+    index: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+    empty: List[int] = []
+    candidates = []
+
+    for j, tokens in enumerate(token_sets):
+        size = len(tokens)
+        if not size:
+            candidates.extend((i, j) for i in empty)
+            empty.append(j)
+            continue
+
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = size - math.ceil(jaccard_threshold * size - 1e-9) + 1
+
+        seen = set()
+        for token in ordered[:prefix]:
+            seen.update(index[token])
+            index[token].append(j)
+
+        for i in sorted(seen):
+            overlap = len(token_sets[i] & tokens)
+            if overlap / (len(token_sets[i]) + size - overlap) >= jaccard_threshold - 1e-9:
+                candidates.append((i, j))
+
+    return candidates
+
+
+def _similar_name_pairs(names: List[str], threshold: float) -> List[Tuple[int, int]]:
+    """
+    Name pairs whose difflib ratio is above threshold.
+
+    Used when RapidFuzz is unavailable; only pairs from _name_candidates
+    are scored.
+    """
     from difflib import SequenceMatcher
 
-    duplicates = []
+    pairs = []
+
+    # Candidates are grouped by j, so seq2 is indexed once per j
+    matcher = SequenceMatcher()
+    current_j = None
 
-    for i in range(len(items)):
-        for j in range(i + 1, len(items)):
-            item1, item2 = items[i], items[j]
+    for i, j in _name_candidates(names, threshold):
+        if j != current_j:
+            matcher.set_seq2(names[j])
+            current_j = j
+        matcher.set_seq1(names[i])
+        if matcher.ratio() > threshold:
+            pairs.append((i, j))
 
-            # Skip if different types
-            if item1.get('type') != item2.get('type'):
-                continue
+    return pairs
 
-            # Compare names
-            name_sim = SequenceMatcher(None,
-                                      item1.get('name', '').lower(),
-                                      item2.get('name', '').lower()).ratio()
 
-            # Compare explanations
-            exp_sim = SequenceMatcher(None,
-                                     item1.get('explanation', '')[:200].lower(),
-                                     item2.get('explanation', '')[:200].lower()).ratio()
+def _similar_pairs_difflib(texts: List[str], threshold: float) -> List[Tuple[int, int]]:
+    """
+    Pairs whose difflib ratio is above threshold.
+    """
+    from difflib import SequenceMatcher
 
-            # If either is very similar, flag as potential duplicate
-            if name_sim > threshold or exp_sim > threshold:
-                duplicates.append((i, j))
+    pairs = []
 
-    return duplicates
+    # SequenceMatcher indexes seq2, so build that once per j and only
+    # swap seq1 for each earlier item
+    matcher = SequenceMatcher()
+
+    for j in range(len(texts)):
+        matcher.set_seq2(texts[j])
+
+        for i in range(j):
+            matcher.set_seq1(texts[i])
+            if matcher.ratio() > threshold:
+                pairs.append((i, j))
+
+    return pairs
+
+
+def _similar_pairs_cdist(texts: List[str], threshold: float) -> List[Tuple[int, int]]:
+    """
+    Pairs whose RapidFuzz ratio is above threshold, via one similarity matrix.
+    """
+    # Scores are 0-100; anything under the cutoff is reported as 0
+    cutoff = threshold * 100
+    similarity = rf_process.cdist(texts, texts, scorer=rf_fuzz.ratio,
+                                  score_cutoff=cutoff, workers=-1)
+
+    pairs = np.argwhere(np.triu(similarity > cutoff, 1))
+    return [(int(i), int(j)) for i, j in pairs]
 
 
 def create_workspace_structure(problem_id: str, base_dir: str = "workspace") -> Dict[str, str]:
@@ -139,8 +457,11 @@ def create_workspace_structure(problem_id: str, base_dir: str = "workspace") ->
         'summaries': workspace_path / 'summaries',
     }
 
-    for dir_path in directories.values():
-        dir_path.mkdir(parents=True, exist_ok=True)
+    # Create the shared parent once; each leaf then needs a single mkdir
+    workspace_path.mkdir(parents=True, exist_ok=True)
+    for purpose, dir_path in directories.items():
+        if purpose != 'workspace':
+            dir_path.mkdir(exist_ok=True)
 
     return {k: str(v) for k, v in directories.items()}
 
@@ -151,6 +472,19 @@ def generate_problem_id(problem_statement: str) -> str:
 
     Format: problem_{sanitized_name}_{timestamp}
     """
+    name_part = _problem_name_part(problem_statement)
+
+    # Add timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    return f"problem_{name_part}_{timestamp}"
+
+
+@lru_cache(maxsize=512)
+def _problem_name_part(problem_statement: str) -> str:
+    """
+    Sanitized name portion of a problem ID (everything but the timestamp).
+    """
     # Extract key words from statement
     words = problem_statement.lower().split()
     # Take first 3-4 significant words
@@ -158,12 +492,7 @@ def generate_problem_id(problem_statement: str) -> str:
     name_part = '_'.join(significant_words)
 
     # Sanitize
-    name_part = ''.join(c if c.isalnum() or c == '_' else '' for c in name_part)
-
-    # Add timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    return f"problem_{name_part}_{timestamp}"
+    return ''.join(c if c.isalnum() or c == '_' else '' for c in name_part)
 
 
 def merge_distilled_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -179,30 +508,32 @@ def merge_distilled_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Find duplicates
     duplicate_pairs = find_similar_concepts(items, threshold=0.85)
 
-    # Build merge groups (using union-find-like approach)
-    merge_groups: Dict[int, Set[int]] = {}
+    # Build merge groups with union-find over item indices
+    parent = list(range(len(items)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
     for i, j in duplicate_pairs:
-        # Find existing groups
-        group_i = next((g for g, members in merge_groups.items() if i in members), None)
-        group_j = next((g for g, members in merge_groups.items() if j in members), None)
-
-        if group_i is None and group_j is None:
-            # Create new group
-            merge_groups[i] = {i, j}
-        elif group_i is not None and group_j is None:
-            merge_groups[group_i].add(j)
-        elif group_i is None and group_j is not None:
-            merge_groups[group_j].add(i)
-        elif group_i != group_j:
-            # Merge groups
-            merge_groups[group_i].update(merge_groups[group_j])
-            del merge_groups[group_j]
-
-    # Items not in any group
-    all_grouped = set()
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_i] = root_j
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for idx in range(len(items)):
+        groups[find(idx)].append(idx)
+
+    merge_groups = {root: members for root, members in groups.items() if len(members) > 1}
+
+    # Items not in any group, via a flat byte-per-item flag array
+    grouped = bytearray(len(items))
     for members in merge_groups.values():
-        all_grouped.update(members)
-    ungrouped = set(range(len(items))) - all_grouped
+        for idx in members:
+            grouped[idx] = 1
+    ungrouped = [idx for idx, flag in enumerate(grouped) if not flag]
 
     # Merge items in each group
     merged_items = []
@@ -8,32 +8,75 @@ Since JSON5 isn't standard in Python, we use a simple approach:
 - For writing: add back formatting and comments based on templates
 """
 
+import functools
+import io
 import json
+import mmap
+import os
 import re
+import shutil
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, TextIO, Union
+
+# Optional faster decoder; both accept bytes and raise json.JSONDecodeError
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# Escapes quotes, backslashes and newlines; keeps non-ASCII text readable
+_dumps = functools.partial(json.dumps, ensure_ascii=False)
+
+# One execution step in a trace summary
+_STEP_FMT = "### Step {step}: {what}\n- **Tool:** `{tool}`\n- **Result:** {result}\n\n"
+
+# JSON5 building blocks for the comment stripper (bytes, DOTALL)
+_STRING = rb'"[^"\\]*(?:\\(?:.|\Z)[^"\\]*)*(?:"|\Z)'
+_COMMENTS_THEN_CLOSER = rb'\s*(?:(?://[^\n]*|/\*.*?\*/)\s*)*[}\]]'
+
+# One left-to-right scan. Group 1 matches a run of code and whole string
+# literals, which is kept; comments and trailing commas match outside the
+# group and are replaced by nothing. Runs are capped at 256 tokens so the
+# regex engine's per-iteration state stays small on comment-free files
+_JSON5_NOISE = re.compile(
+    rb'((?:[^"/,]+'
+    rb'|' + _STRING +
+    rb'|,(?!\s*[}\]/])'                                # comma before another value
+    rb'|,(?=\s*/)(?!' + _COMMENTS_THEN_CLOSER + rb')'  # comma, comment, another value
+    rb'|/(?![/*])'
+    rb'){1,256})'
+    rb'|//[^\n]*'
+    rb'|/\*.*?(?:\*/|\Z)'
+    rb'|,',
+    re.DOTALL,
+)
 
 
 def strip_json5_comments(json5_str: str) -> str:
     """
     Remove single-line (//) and multi-line (/* */) comments from JSON5 string.
 
+    Strings are matched as whole tokens in the same pass, so comment markers
+    inside strings (e.g. URLs) are preserved. Trailing commas before closing
+    braces/brackets are dropped.
+
     Args:
         json5_str: JSON5 formatted string with comments
 
     Returns:
         JSON-parseable string with comments removed
     """
-    # Remove single-line comments
-    result = re.sub(r'//.*?$', '', json5_str, flags=re.MULTILINE)
+    return _strip_json5_bytes(json5_str.encode('utf-8')).decode('utf-8')
 
-    # Remove multi-line comments
-    result = re.sub(r'/\*.*?\*/', '', result, flags=re.DOTALL)
 
-    # Remove trailing commas before closing braces/brackets (JSON5 allows these)
-    result = re.sub(r',(\s*[}\]])', r'\1', result)
+def _strip_json5_bytes(data: Union[bytes, mmap.mmap]) -> bytes:
+    """
+    Byte-level comment stripper behind strip_json5_comments.
 
-    return result
+    Accepts any bytes-like buffer (including an mmap) and returns the cleaned
+    UTF-8 document, which the JSON decoder accepts without decoding first.
+    """
+    return _JSON5_NOISE.sub(rb'\1', data)
 
 
 def parse_json5(json5_str: str) -> Dict[str, Any]:
@@ -46,8 +89,8 @@ def parse_json5(json5_str: str) -> Dict[str, Any]:
     Returns:
         Parsed dictionary
     """
-    clean_json = strip_json5_comments(json5_str)
-    return json.loads(clean_json)
+    clean_json = _strip_json5_bytes(json5_str.encode('utf-8'))
+    return _json.loads(clean_json)
 
 
 def load_json5_file(filepath: str) -> Dict[str, Any]:
@@ -60,84 +103,94 @@ def load_json5_file(filepath: str) -> Dict[str, Any]:
     Returns:
         Parsed dictionary
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    return parse_json5(content)
+    with open(filepath, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return _json.loads(_strip_json5_bytes(f.read()))
+
+        try:
+            return _json.loads(_strip_json5_bytes(mm))
+        finally:
+            mm.close()
 
 
-def format_playbook_to_json5(playbook: Dict[str, Any]) -> str:
+def format_playbook_to_json5(playbook: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
     """
     Convert a playbook dict to human-readable JSON5 with inline comments.
 
     Args:
         playbook: Playbook dictionary with bullets
+        out: Optional text stream to write into instead of building a string
 
     Returns:
-        Formatted JSON5 string with comments
+        Formatted JSON5 string with comments, or None when written to out
     """
-    lines = [
-        "{",
-        "  // ACE Playbook - Evolving agent heuristics through Generator → Reflector → Curator loop",
-        f"  // Last updated: {datetime.utcnow().isoformat()}Z",
-        "",
-    ]
+    buffer = io.StringIO() if out is None else out
+    write = buffer.write
+
+    write("{\n")
+    write("  // ACE Playbook - Evolving agent heuristics through Generator → Reflector → Curator loop\n")
+    write(f"  // Last updated: {datetime.utcnow().isoformat()}Z\n")
+    write("\n")
 
     # Add metadata if present
     if "metadata" in playbook:
         meta = playbook["metadata"]
-        lines.append('  "metadata": {')
-        lines.append(f'    "version": "{meta.get("version", "1.0.0")}",')
-        lines.append(f'    "total_tasks_processed": {meta.get("total_tasks_processed", 0)},')
-        lines.append(f'    "created_at": "{meta.get("created_at", "")}",')
-        lines.append(f'    "last_updated": "{meta.get("last_updated", "")}"')
-        lines.append("  },")
-        lines.append("")
+        write('  "metadata": {\n')
+        write(f'    "version": {_dumps(meta.get("version", "1.0.0"))},\n')
+        write(f'    "total_tasks_processed": {meta.get("total_tasks_processed", 0)},\n')
+        write(f'    "created_at": {_dumps(meta.get("created_at", ""))},\n')
+        write(f'    "last_updated": {_dumps(meta.get("last_updated", ""))}\n')
+        write("  },\n")
+        write("\n")
 
     # Add bullets array
-    lines.append('  "bullets": [')
+    write('  "bullets": [\n')
 
     bullets = playbook.get("bullets", [])
     for i, bullet in enumerate(bullets):
         is_last = (i == len(bullets) - 1)
 
-        lines.append("    {")
-        lines.append(f'      "id": "{bullet["id"]}",')
-        lines.append(f'      "text": "{bullet["text"]}",')
+        write("    {\n")
+        write(f'      "id": {_dumps(bullet["id"])},\n')
+        write(f'      "text": {_dumps(bullet["text"])},\n')
 
         # Add inline comments for counters
         helpful_comment = f"  // Proved helpful {bullet['helpful']} times"
         harmful_comment = f"  // Caused issues {bullet['harmful']} times"
 
-        lines.append(f'      "helpful": {bullet.get("helpful", 0)},{helpful_comment}')
-        lines.append(f'      "harmful": {bullet.get("harmful", 0)},{harmful_comment}')
+        write(f'      "helpful": {bullet.get("helpful", 0)},{helpful_comment}\n')
+        write(f'      "harmful": {bullet.get("harmful", 0)},{harmful_comment}\n')
 
         # Optional fields
         if "created_at" in bullet:
-            lines.append(f'      "created_at": "{bullet["created_at"]}",')
+            write(f'      "created_at": {_dumps(bullet["created_at"])},\n')
         if "last_triggered" in bullet:
-            lt = bullet["last_triggered"]
-            lt_value = f'"{lt}"' if lt else "null"
-            lines.append(f'      "last_triggered": {lt_value},')
+            write(f'      "last_triggered": {_dumps(bullet["last_triggered"])},\n')
 
         # Examples array
         examples = bullet.get("examples", [])
         if examples:
-            lines.append(f'      "examples": {json.dumps(examples)}')
+            write(f'      "examples": {_dumps(examples)}\n')
         else:
-            lines.append('      "examples": []  // Evidence from traces where this was helpful')
+            write('      "examples": []  // Evidence from traces where this was helpful\n')
 
         # Closing brace
         comma = "," if not is_last else ""
-        lines.append(f"    }}{comma}")
+        write(f"    }}{comma}\n")
 
         # Add blank line between bullets for readability
         if not is_last:
-            lines.append("")
+            write("\n")
 
-    lines.append("  ]")
-    lines.append("}")
+    write("  ]\n")
+    write("}")
 
-    return "\n".join(lines)
+    if out is None:
+        return buffer.getvalue()
+    return None
 
 
 def save_playbook_json5(playbook: Dict[str, Any], filepath: str) -> None:
@@ -148,9 +201,20 @@ def save_playbook_json5(playbook: Dict[str, Any], filepath: str) -> None:
         playbook: Playbook dictionary
         filepath: Path to save file
     """
-    json5_content = format_playbook_to_json5(playbook)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(json5_content)
+    # Stream into a sibling temp file and swap it in, so a formatting error
+    # never leaves a truncated playbook behind
+    directory, name = os.path.split(os.path.abspath(filepath))
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            format_playbook_to_json5(playbook, out=f)
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def generate_trace_markdown(trace: Dict[str, Any], task: str) -> str:
@@ -164,68 +228,54 @@ def generate_trace_markdown(trace: Dict[str, Any], task: str) -> str:
     Returns:
         Markdown formatted summary
     """
-    lines = [
-        f"# ACE Trace Summary",
-        "",
-        f"**Task:** {task}",
-        f"**Timestamp:** {datetime.utcnow().isoformat()}Z",
-        "",
-        "## Plan",
-        "",
-        trace.get("plan", "No plan provided"),
-        "",
-        "## Execution Steps",
-        "",
-    ]
+    buffer = io.StringIO()
+    write = buffer.write
+
+    write("# ACE Trace Summary\n\n")
+    write(f"**Task:** {task}\n")
+    write(f"**Timestamp:** {datetime.utcnow().isoformat()}Z\n\n")
+    write(f"## Plan\n\n{trace.get('plan', 'No plan provided')}\n\n")
+    write("## Execution Steps\n\n")
 
     actions = trace.get("actions", [])
     for action in actions:
-        step = action.get("step", "?")
-        what = action.get("what", "Unknown action")
-        tool = action.get("tool", "None")
-        result = action.get("result_summary", "No result")
-
-        lines.append(f"### Step {step}: {what}")
-        lines.append(f"- **Tool:** `{tool}`")
-        lines.append(f"- **Result:** {result}")
-        lines.append("")
+        write(_STEP_FMT.format(
+            step=action.get("step", "?"),
+            what=action.get("what", "Unknown action"),
+            tool=action.get("tool", "None"),
+            result=action.get("result_summary", "No result"),
+        ))
 
     # Bullets referenced
     bullets_ref = trace.get("bullets_referenced", [])
     if bullets_ref:
-        lines.append("## Playbook Bullets Referenced")
-        lines.append("")
+        write("## Playbook Bullets Referenced\n\n")
         for bullet_id in bullets_ref:
-            lines.append(f"- {bullet_id}")
-        lines.append("")
+            write(f"- {bullet_id}\n")
+        write("\n")
 
     # Outcome
     outcome = trace.get("outcome", {})
     success = outcome.get("success", False)
     status_emoji = "✓" if success else "✗"
 
-    lines.append(f"## Outcome {status_emoji}")
-    lines.append("")
-    lines.append(f"**Success:** {success}")
+    write(f"## Outcome {status_emoji}\n\n")
+    write(f"**Success:** {success}\n")
 
     if "answer_or_artifact" in outcome:
-        lines.append(f"**Result:** {outcome['answer_or_artifact']}")
+        write(f"**Result:** {outcome['answer_or_artifact']}\n")
 
     if "notes" in outcome:
-        lines.append(f"**Notes:** {outcome['notes']}")
-
-    lines.append("")
+        write(f"**Notes:** {outcome['notes']}\n")
 
     # Failures or frictions
     failures = trace.get("failures_or_frictions", [])
     if failures:
-        lines.append("## Issues Encountered")
-        lines.append("")
+        write("\n## Issues Encountered\n\n")
         for failure in failures:
-            lines.append(f"- {failure}")
-        lines.append("")
+            write(f"- {failure}\n")
 
-    return "\n".join(lines)
+    return buffer.getvalue()
 
 
 if __name__ == "__main__":